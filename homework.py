@@ -1,8 +1,12 @@
+import atexit
+import functools
 import logging
 import os
+import random
 import sys
 import time
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
 
 import requests
 import telegram
@@ -15,9 +19,17 @@ TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_TIME = 600
+MAX_BACKOFF = 3600
+JITTER = 30
+MAX_ERRORS = 10
+NOTIFY_BACKOFF = RETRY_TIME
+MAX_NOTIFY_BACKOFF = 6 * 3600
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
-LOG_FILENAME = __file__ + '.log'
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FILE = os.getenv('LOG_FILE')
 
 HOMEWORK_VERDICTS = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
@@ -27,7 +39,8 @@ HOMEWORK_VERDICTS = {
 
 MESSAGE = 'Отправка сообщения в чат: {message}'
 REQUEST_PARAMS = (' Используемые параметры запроса:'
-                  ' url: {url}; headers: {headers}; params: {params}')
+                  ' url: {url}; headers: {headers}; params: {params};'
+                  ' timeout: {timeout}')
 RESPONSE_ERROR = ('Неожиданный ответ сервера.'
                   ' Код ответа API: {status_code}') + REQUEST_PARAMS
 CONNECTION_ERROR = ('Проблемы с подключением к серверу:'
@@ -45,21 +58,39 @@ ENVIRONMENT_VARIABLES_MISSING = (
 STOP_BOT = 'Программа принудительно остановлена.'
 STATUS_NOT_CHANGE = 'В ответе отсутствуют новые статусы домашней работы'
 ERROR_MESSAGE = 'Сбой в работе программы: {error}'
+UNKNOWN_LOG_LEVEL = ('Неизвестный уровень логирования {level},'
+                     ' используется INFO')
 TOKENS_NAMES = ('PRACTICUM_TOKEN', 'TELEGRAM_TOKEN', 'TELEGRAM_CHAT_ID')
 
+_etag = None
+_cached_answer = None
+
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+logger.propagate = False
 formatter = logging.Formatter('%(asctime)s [%(levelname)s] Event: %(message)s')
 
 console_handler = logging.StreamHandler(sys.stdout)
 console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+_log_handlers = [console_handler]
+
+if LOG_FILE:
+    file_handler = RotatingFileHandler(
+        LOG_FILE, maxBytes=1000000, backupCount=2
+    )
+    file_handler.setFormatter(formatter)
+    _log_handlers.append(file_handler)
 
-file_handler = RotatingFileHandler(
-    LOG_FILENAME, maxBytes=1000000, backupCount=2
-)
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
+_log_queue = SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+try:
+    logger.setLevel(LOG_LEVEL)
+except ValueError:
+    logger.setLevel(logging.INFO)
+    logger.warning(UNKNOWN_LOG_LEVEL.format(level=LOG_LEVEL))
 
 
 def send_message(bot, message):
@@ -70,27 +101,39 @@ def send_message(bot, message):
 
 def get_api_answer(timestamp):
     """Запрос к эндпоинту API-сервиса."""
+    global _etag, _cached_answer
+    headers = HEADERS
+    conditional = _etag is not None and _etag[0] == timestamp
+    if conditional:
+        headers = {**HEADERS, 'If-None-Match': _etag[1]}
     request = {
         'url': ENDPOINT,
-        'headers': HEADERS,
-        'params': {'from_date': timestamp}
+        'headers': headers,
+        'params': {'from_date': timestamp},
+        'timeout': (CONNECT_TIMEOUT, READ_TIMEOUT)
     }
     try:
         homework_statuses_json = requests.get(**request)
     except requests.exceptions.RequestException as error:
         raise ConnectionError(CONNECTION_ERROR.format(**request, error=error))
+    status_code = homework_statuses_json.status_code
+    if status_code == 304 and conditional:
+        return _cached_answer
     homework_statuses = homework_statuses_json.json()
-    for field in ['error', 'code']:
+    for field in ('error', 'code'):
         if field in homework_statuses:
             raise RuntimeError(UNEXPECTED_RESPONSE.format(
                 **request,
-                error=homework_statuses.get(field),
-                status_code=homework_statuses_json.status_code
+                error=homework_statuses[field],
+                status_code=status_code
             ))
-    if homework_statuses_json.status_code != 200:
+    if status_code != 200:
         raise ValueError(RESPONSE_ERROR.format(
-            **request, status_code=homework_statuses_json.status_code
+            **request, status_code=status_code
         ))
+    etag = homework_statuses_json.headers.get('ETag')
+    _etag = (timestamp, etag) if etag else None
+    _cached_answer = homework_statuses
     return homework_statuses
 
 
@@ -98,17 +141,15 @@ def check_response(response):
     """Проверка ответа API на корректность."""
     if not isinstance(response, dict):
         raise TypeError(UNEXPECTED_RESPONSE_TYPE.format(type=type(response)))
-    if not isinstance(response.get('homeworks'), list):
-        raise TypeError(UNEXPECTED_HOMEWORK_TYPE.format(
-            type=type(response.get('homeworks'))
-        ))
-    return response.get('homeworks')
+    homeworks = response.get('homeworks')
+    if not isinstance(homeworks, list):
+        raise TypeError(UNEXPECTED_HOMEWORK_TYPE.format(type=type(homeworks)))
+    return homeworks
 
 
-def parse_status(homework):
-    """Извлекает статус домашней работы работы."""
-    homework_name = homework['homework_name']
-    status = homework['status']
+@functools.lru_cache(maxsize=256)
+def _parse_status(homework_name, status):
+    """Формирует сообщение об изменении статуса домашней работы."""
     if status not in HOMEWORK_VERDICTS:
         raise ValueError(UNEXPECTED_STATUS.format(status=status))
     return HOMEWORK_STATUS_CHANGE.format(
@@ -116,6 +157,11 @@ def parse_status(homework):
     )
 
 
+def parse_status(homework):
+    """Извлекает статус домашней работы работы."""
+    return _parse_status(homework['homework_name'], homework['status'])
+
+
 def check_tokens():
     """Проверяет доступность необходимых переменных окружения."""
     missing_tokens = [name for name in TOKENS_NAMES if not globals()[name]]
@@ -127,6 +173,24 @@ def check_tokens():
     return True
 
 
+def _try_notify(bot, message, state):
+    """Отправляет сообщение об ошибке с ограничением частоты повторов."""
+    if time.monotonic() < state['next_allowed']:
+        return False
+    try:
+        send_message(bot, message)
+    except Exception as error:
+        logger.exception(ERROR_MESSAGE.format(error=error))
+        state['next_allowed'] = time.monotonic() + min(
+            NOTIFY_BACKOFF * 2 ** state['errors'] * random.uniform(0.5, 1.5),
+            MAX_NOTIFY_BACKOFF
+        )
+        state['errors'] = min(state['errors'] + 1, MAX_ERRORS)
+        return False
+    state['errors'] = 0
+    return True
+
+
 def main():
     """Основная логика работы бота."""
     if not check_tokens():
@@ -134,28 +198,36 @@ def main():
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
     timestamp = int(time.time())
     sent_message = ''
+    sent_status = None
+    errors = 0
+    notify_state = {'next_allowed': 0.0, 'errors': 0}
     while True:
         try:
             response = get_api_answer(timestamp)
             new_homeworks = check_response(response)
             if new_homeworks:
-                send_message(bot, parse_status(new_homeworks[0]))
+                homework = new_homeworks[0]
+                status = (homework['homework_name'], homework['status'])
+                if sent_status != status:
+                    send_message(bot, parse_status(homework))
+                    sent_status = status
             else:
                 logger.debug(STATUS_NOT_CHANGE)
         except Exception as error:
             message = ERROR_MESSAGE.format(error=error)
             logger.exception(message)
-            if sent_message != message:
-                try:
-                    send_message(bot, message)
-                except Exception as error:
-                    logger.exception(ERROR_MESSAGE.format(error=error))
-                else:
-                    sent_message = message
+            errors = min(errors + 1, MAX_ERRORS)
+            if (sent_message != message
+                    and _try_notify(bot, message, notify_state)):
+                sent_message = message
         else:
             timestamp = response.get('current_date', timestamp)
+            errors = 0
         finally:
-            time.sleep(RETRY_TIME)
+            time.sleep(
+                min(RETRY_TIME * 2 ** errors, MAX_BACKOFF)
+                + random.uniform(0, JITTER)
+            )
 
 
 if __name__ == '__main__':
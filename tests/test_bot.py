@@ -44,6 +44,7 @@ class MockResponseGET:
         )
         self.random_timestamp = random_timestamp
         self.status_code = http_status
+        self.headers = {}
 
     def json(self):
         data = {
@@ -247,6 +248,242 @@ class TestHomework:
                 'когда API возвращает код, отличный от 200'
             )
 
+    def test_get_api_answer_etag(self, monkeypatch, random_timestamp,
+                                 current_timestamp, api_url):
+        etags = iter(['"v1"', None, '"v2"', None])
+        sent_etags = []
+
+        def mock_etag_response_get(*args, **kwargs):
+            sent_etags.append(kwargs['headers'].get('If-None-Match'))
+            response = MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                current_timestamp=kwargs['params']['from_date'], **kwargs
+            )
+            etag = next(etags)
+            if etag:
+                response.headers = {'ETag': etag}
+            return response
+
+        monkeypatch.setattr(requests, 'get', mock_etag_response_get)
+
+        import homework
+
+        monkeypatch.setattr(homework, '_etag', None)
+        monkeypatch.setattr(homework, '_cached_answer', None)
+
+        func_name = 'get_api_answer'
+        for timestamp in (current_timestamp, current_timestamp,
+                          current_timestamp, current_timestamp + 1):
+            homework.get_api_answer(timestamp)
+        assert sent_etags == [None, '"v1"', None, None], (
+            f'Убедитесь, что функция `{func_name}` передаёт ETag '
+            'предыдущего ответа в заголовке If-None-Match только для того '
+            'же `from_date` и не передаёт его, если в ответе ETag отсутствует'
+        )
+
+    def test_get_304_api_answer_after_failure(self, monkeypatch,
+                                              random_timestamp,
+                                              current_timestamp, api_url):
+        homeworks = [{'homework_name': 'hw123', 'status': 'approved'}]
+        responses = iter([
+            (HTTPStatus.OK, {'ETag': '"v1"'}, homeworks),
+            (HTTPStatus.NOT_MODIFIED, {}, None),
+        ])
+        sent_etags = []
+
+        def mock_etag_response_get(*args, **kwargs):
+            sent_etags.append(kwargs['headers'].get('If-None-Match'))
+            http_status, headers, data = next(responses)
+            response = MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                current_timestamp=current_timestamp,
+                http_status=http_status, **kwargs
+            )
+
+            def response_json():
+                if data is None:
+                    raise ValueError('Пустое тело ответа')
+                return {'homeworks': data, 'current_date': random_timestamp}
+
+            response.headers = headers
+            response.json = response_json
+            return response
+
+        monkeypatch.setattr(requests, 'get', mock_etag_response_get)
+
+        import homework
+
+        monkeypatch.setattr(homework, '_etag', None)
+        monkeypatch.setattr(homework, '_cached_answer', None)
+
+        func_name = 'get_api_answer'
+        first = homework.get_api_answer(current_timestamp)
+        retry = homework.get_api_answer(current_timestamp)
+        assert sent_etags == [None, '"v1"']
+        assert retry == first and retry['homeworks'] == homeworks, (
+            f'Убедитесь, что функция `{func_name}` при ответе 304 '
+            'возвращает последний полученный ответ, чтобы не потерять '
+            'статус при повторе запроса после сбоя'
+        )
+
+    def test_main_backoff(self, monkeypatch, random_timestamp):
+        class StopPolling(Exception):
+            pass
+
+        def mock_telegram_bot(*args, **kwargs):
+            return MockTelegramBot(*args, random_timestamp=random_timestamp, **kwargs)
+
+        import homework
+
+        answers = iter([
+            ConnectionError('Сервер недоступен'),
+            ConnectionError('Сервер недоступен'),
+            ConnectionError('Сервер недоступен'),
+            {'homeworks': [], 'current_date': random_timestamp},
+        ])
+        delays = []
+
+        def mock_get_api_answer(timestamp):
+            answer = next(answers)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        def mock_sleep(seconds):
+            delays.append(seconds)
+            if len(delays) == 4:
+                raise StopPolling
+
+        monkeypatch.setattr(telegram, 'Bot', mock_telegram_bot)
+        monkeypatch.setattr(homework, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        monkeypatch.setattr(homework, 'get_api_answer', mock_get_api_answer)
+        monkeypatch.setattr(homework.time, 'sleep', mock_sleep)
+        monkeypatch.setattr(homework.random, 'uniform', lambda a, b: 0)
+
+        try:
+            homework.main()
+        except StopPolling:
+            pass
+        retry_time = homework.RETRY_TIME
+        assert delays == [
+            2 * retry_time, 4 * retry_time,
+            homework.MAX_BACKOFF, retry_time
+        ], (
+            'Убедитесь, что после сбоев пауза между запросами растёт '
+            'экспоненциально, ограничена MAX_BACKOFF и сбрасывается '
+            'после успешного запроса'
+        )
+
+    def test_notify_throttle(self, monkeypatch):
+        class FailingBot:
+            calls = 0
+
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                FailingBot.calls += 1
+                raise telegram.error.NetworkError('Too Many Requests')
+
+        import homework
+
+        now = [0.0]
+        monkeypatch.setattr(homework.time, 'monotonic', lambda: now[0])
+        monkeypatch.setattr(homework.random, 'uniform', lambda a, b: 1)
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        state = {'next_allowed': 0.0, 'errors': 0}
+        bot = FailingBot()
+
+        assert not homework._try_notify(bot, 'message', state)
+        now[0] = homework.NOTIFY_BACKOFF - 1
+        assert not homework._try_notify(bot, 'message', state)
+        assert FailingBot.calls == 1, (
+            'Убедитесь, что после сбоя отправки повторная отправка '
+            'откладывается'
+        )
+        now[0] = homework.NOTIFY_BACKOFF
+        assert not homework._try_notify(bot, 'message', state)
+        assert FailingBot.calls == 2
+        assert state['next_allowed'] == 3 * homework.NOTIFY_BACKOFF
+
+    def run_main(self, monkeypatch, answers, bot):
+        class StopPolling(Exception):
+            pass
+
+        import homework
+
+        answers = iter(answers)
+        polls = []
+
+        def mock_get_api_answer(timestamp):
+            return next(answers)
+
+        def mock_sleep(seconds):
+            polls.append(seconds)
+            if len(polls) == 4:
+                raise StopPolling
+
+        monkeypatch.setattr(telegram, 'Bot', lambda *args, **kwargs: bot)
+        monkeypatch.setattr(homework, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        monkeypatch.setattr(homework, 'get_api_answer', mock_get_api_answer)
+        monkeypatch.setattr(homework.time, 'sleep', mock_sleep)
+        try:
+            homework.main()
+        except StopPolling:
+            pass
+
+    def make_answers(self, *statuses):
+        return [
+            {
+                'homeworks': [{'homework_name': 'hw123', 'status': status}],
+                'current_date': index
+            }
+            for index, status in enumerate(statuses)
+        ]
+
+    def test_main_skips_repeated_status(self, monkeypatch):
+        class RecordingBot:
+            def __init__(self):
+                self.messages = []
+
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                self.messages.append(text)
+
+        bot = RecordingBot()
+        self.run_main(monkeypatch, self.make_answers(
+            'reviewing', 'reviewing', 'approved', 'approved'
+        ), bot)
+        assert [message.endswith(self.HOMEWORK_STATUSES['reviewing'])
+                for message in bot.messages] == [True, False], (
+            'Убедитесь, что повторный статус домашней работы не '
+            'отправляется, а изменившийся статус отправляется один раз'
+        )
+        assert bot.messages[1].endswith(self.HOMEWORK_STATUSES['approved'])
+
+    def test_main_retries_failed_status(self, monkeypatch):
+        class FlakyBot:
+            def __init__(self):
+                self.messages = []
+
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                self.messages.append(text)
+                if len(self.messages) == 1:
+                    raise telegram.error.NetworkError('Bad Gateway')
+
+        bot = FlakyBot()
+        self.run_main(monkeypatch, self.make_answers(
+            'reviewing', 'reviewing', 'reviewing', 'reviewing'
+        ), bot)
+        status_messages = [
+            message for message in bot.messages
+            if message.endswith(self.HOMEWORK_STATUSES['reviewing'])
+        ]
+        assert len(status_messages) == 2, (
+            'Убедитесь, что статус домашней работы отправляется повторно, '
+            'если предыдущая отправка завершилась ошибкой'
+        )
+
     def test_parse_status(self, random_timestamp):
         test_data = {
             "id": 123,